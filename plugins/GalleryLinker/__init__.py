@@ -1,6 +1,20 @@
 """GalleryLinker plugin for Stash."""
 
-from . import datatypes, gallery_linker
-from .gallery_linker import GalleryLinker
-
 __all__ = ["GalleryLinker", "datatypes", "gallery_linker"]
+
+
+def __getattr__(name):
+    """Lazy-load submodules (PEP 562) so importing the package stays cheap.
+
+    gallery_linker pulls in stashapi/StashInterface, which is only needed
+    once the plugin is actually invoked.
+    """
+    if name == "GalleryLinker":
+        from .gallery_linker import GalleryLinker
+
+        return GalleryLinker
+    if name in ("datatypes", "gallery_linker"):
+        import importlib
+
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,63 @@
 from dataclasses import dataclass, field
 
 
+@dataclass(slots=True, frozen=True)
+class ScoringConfig:
+    """Weights and thresholds used when scoring scene-gallery matches."""
+
+    title_similarity_weight: float = field(default=0.4)
+    date_match_weight: float = field(default=0.3)
+    filename_similarity_weight: float = field(default=0.2)
+    performer_overlap_weight: float = field(default=0.1)
+    title_similarity_threshold: float = field(default=0.7)
+    filename_similarity_threshold: float = field(default=0.6)
+
+    def __post_init__(self):
+        """Validate that the scoring weights form a proper weighted average."""
+        total = (
+            self.title_similarity_weight
+            + self.date_match_weight
+            + self.filename_similarity_weight
+            + self.performer_overlap_weight
+        )
+        if abs(total - 1.0) > 0.01:
+            raise ValueError(f"Scoring weights must sum to 1.0, got {total}")
+
+
+# Validated once at import time; shared by all callers that don't override
+# scoring settings.
+DEFAULT_SCORING_CONFIG = ScoringConfig()
+
+
+@dataclass(slots=True, frozen=True)
+class MatchResult:
+    """A single scored scene-gallery match candidate."""
+
+    scene: dict
+    score: float
+    reasons: tuple = field(default=())
+
+    def __post_init__(self):
+        """Validate that the score is a valid normalized value."""
+        if not (0 <= self.score <= 1):
+            raise ValueError(f"Match score must be between 0 and 1, got {self.score}")
+
+    @classmethod
+    def unchecked(cls, scene: dict, score: float, reasons: tuple = ()) -> "MatchResult":
+        """
+        Construct a MatchResult without running __init__/__post_init__.
+
+        For hot loops whose scores are already known to be in range (the
+        matcher only materializes heap entries that passed the minimum-score
+        gate); user-facing code should use the normal constructor.
+        """
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "scene", scene)
+        object.__setattr__(obj, "score", score)
+        object.__setattr__(obj, "reasons", reasons)
+        return obj
+
+
 @dataclass
 class SettingsSchema:
     """Schema for plugin settings."""
@@ -21,9 +78,12 @@ class SettingsSchema:
 
     def __post_init__(self):
         """Validate settings values."""
+        # Fused check keeps the valid path to a single branch; the specific
+        # failure is only diagnosed once something is out of range.
+        if (0 <= self.minimumScore <= 1) and (0 <= self.autoLinkThreshold <= 1) and (0 <= self.dateTolerance <= 365):
+            return
         if not (0 <= self.minimumScore <= 1):
             raise ValueError("minimumScore must be between 0 and 1")
         if not (0 <= self.autoLinkThreshold <= 1):
             raise ValueError("autoLinkThreshold must be between 0 and 1")
-        if not (0 <= self.dateTolerance <= 365):
-            raise ValueError("dateTolerance must be between 0 and 365")
+        raise ValueError("dateTolerance must be between 0 and 365")
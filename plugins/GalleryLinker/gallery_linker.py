@@ -7,11 +7,11 @@ Links image galleries to related scenes and performers based on file patterns, d
 import argparse
 import contextlib
 import importlib.util
-import json
 import logging
 import os
 import sys
 from typing import Any
+from urllib.parse import urlparse
 
 try:
     import stashapi.log as logger
@@ -21,6 +21,18 @@ except ImportError as e:
     print("Please install required dependencies: pip install stashapp-tools requests")
     sys.exit(1)
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json  # type: ignore[no-redef]
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 if importlib.util.find_spec("GalleryLinker") is None:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     sys.path.insert(0, os.path.abspath(os.path.join(current_dir, "..", "..", "stashapi")))
@@ -52,6 +64,7 @@ class GalleryLinker:
         self.stash = StashInterface(default_config)
         self.settings = parse_settings_argument("")
         self.logger = logger
+        self._debug_enabled = self.logger.sl.level <= logging.DEBUG
 
     def _build_default_config(self) -> dict:
         """Build default Stash connection configuration."""
@@ -64,8 +77,6 @@ class GalleryLinker:
     def _update_config_from_params(self, config: dict, stash_url: str | None, api_key: str | None) -> None:
         """Update configuration with provided URL and API key."""
         if stash_url:
-            from urllib.parse import urlparse
-
             parsed = urlparse(stash_url)
             config.update(
                 {
@@ -84,6 +95,7 @@ class GalleryLinker:
             self.stash = StashInterface(plugin_input["server_connection"])
 
         self.settings = plugin_input.get("args", {})
+        self._debug_enabled = self.logger.sl.level <= logging.DEBUG
 
     def auto_link_scenes(self, link_strategy: str = "name_similarity", dry_run: bool = False) -> dict[str, Any]:
         """Automatically link galleries to scenes."""
@@ -100,7 +112,7 @@ class GalleryLinker:
         self.logger.info(f"Batch Errors: {len(batch_result['errors'])}")
         self.logger.info(f"Batch Skipped: {len(batch_result['skipped'])}")
 
-        if self.logger.sl.level <= logging.DEBUG:
+        if self._debug_enabled:
             self.logger.debug("Detailed linked items:")
             for linked in batch_result["linked"]:
                 self.logger.debug(
@@ -138,7 +150,7 @@ class GalleryLinker:
         self.logger.info(f"Batch Errors: {len(batch_result['errors'])}")
         self.logger.info(f"Batch Skipped: {len(batch_result['skipped'])}")
 
-        if self.logger.sl.level <= logging.DEBUG:
+        if self._debug_enabled:
             self.logger.debug("Detailed linked items:")
             for linked in batch_result["linked"]:
                 self.logger.debug(
@@ -163,16 +175,84 @@ class GalleryLinker:
                 )
         return batch_result  # type: ignore[no-any-return]
 
+    def _fetch_link_counts(self) -> tuple | None:
+        """
+        Count gallery linkage server-side with aliased count-only queries.
+
+        Returns:
+            (total, linked_to_scenes, linked_to_performers, unlinked) or None
+            if the count query fails
+        """
+        query = """
+        query GalleryLinkCounts {
+            total: findGalleries(filter: {per_page: 0}) { count }
+            with_scenes: findGalleries(
+                gallery_filter: {scenes: {modifier: NOT_NULL}}, filter: {per_page: 0}
+            ) { count }
+            with_performers: findGalleries(
+                gallery_filter: {performers: {modifier: NOT_NULL}}, filter: {per_page: 0}
+            ) { count }
+            unlinked: findGalleries(
+                gallery_filter: {scenes: {modifier: IS_NULL}, performers: {modifier: IS_NULL}}
+                filter: {per_page: 0}
+            ) { count }
+        }
+        """
+        try:
+            result = self.stash.call_GQL(query)
+            data = result.get("data", result) if result else {}
+            return (
+                data["total"]["count"],
+                data["with_scenes"]["count"],
+                data["with_performers"]["count"],
+                data["unlinked"]["count"],
+            )
+        except Exception as e:
+            self.logger.warning(f"Count query failed, falling back to client-side counting: {str(e)}")
+            return None
+
     def generate_report(self) -> dict:
         """Generate a report of gallery relationships."""
         self.logger.info("Generating linking report")
 
-        galleries = self.stash.find_galleries()
+        counts = self._fetch_link_counts()
+        if counts is not None:
+            total_galleries, linked_to_scenes, linked_to_performers, unlinked = counts
+            return {
+                "total_galleries": total_galleries,
+                "linked_to_scenes": linked_to_scenes,
+                "linked_to_performers": linked_to_performers,
+                "unlinked": unlinked,
+                "coverage_percentage": (
+                    round((total_galleries - unlinked) / total_galleries * 100, 2) if total_galleries > 0 else 0
+                ),
+            }
+
+        # Only linkage presence is counted, so ask for a three-key projection
+        # instead of the full default gallery payload.
+        galleries = self.stash.find_galleries(
+            f={}, filter={"per_page": -1}, fragment="id scenes { id } performers { id }"
+        )
 
         total_galleries = len(galleries)
-        linked_to_scenes = sum(1 for g in galleries if g.get("scenes"))
-        linked_to_performers = sum(1 for g in galleries if g.get("performers"))
-        unlinked = sum(1 for g in galleries if not g.get("scenes") and not g.get("performers"))
+        if HAS_NUMPY and galleries:
+            # Single pass to populate the flag arrays; the three sums are C loops.
+            has_scene = np.fromiter((bool(g.get("scenes")) for g in galleries), dtype=np.bool_, count=total_galleries)
+            has_perf = np.fromiter(
+                (bool(g.get("performers")) for g in galleries), dtype=np.bool_, count=total_galleries
+            )
+            linked_to_scenes = int(has_scene.sum())
+            linked_to_performers = int(has_perf.sum())
+            unlinked = int((~(has_scene | has_perf)).sum())
+        else:
+            # One pass over the list updates all three counters.
+            linked_to_scenes = linked_to_performers = unlinked = 0
+            for g in galleries:
+                has_scene = bool(g.get("scenes"))
+                has_performer = bool(g.get("performers"))
+                linked_to_scenes += has_scene
+                linked_to_performers += has_performer
+                unlinked += not (has_scene or has_performer)
 
         report = {
             "total_galleries": total_galleries,
@@ -207,11 +287,15 @@ def main():
     # Read from stdin for plugin mode
     plugin_input = None
     if not sys.stdin.isatty():
-        with contextlib.suppress(json.JSONDecodeError):
-            plugin_input = json.loads(sys.stdin.read())
+        # orjson and stdlib json both raise ValueError subclasses on bad input;
+        # reading bytes skips the text-decoding layer.
+        with contextlib.suppress(ValueError):
+            plugin_input = _json.loads(sys.stdin.buffer.read())
 
     linker = GalleryLinker(args.stash_url, args.api_key)
-    logger.debug(f"Plugin input: {plugin_input}")
+    debug_enabled = logger.sl.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logger.debug(f"Plugin input: {plugin_input}")
     if plugin_input:
         linker.load_settings(plugin_input)
     else:
@@ -227,8 +311,9 @@ def main():
                 return 1
 
     mode = linker.settings.get("mode", args.mode)
-    logger.debug(f"Settings: {linker.settings}")
-    logger.debug(f"Mode: {mode}")
+    if debug_enabled:
+        logger.debug(f"Settings: {linker.settings}")
+        logger.debug(f"Mode: {mode}")
     # Execute the requested operation
     try:
         if mode == "auto_link_scenes":
@@ -1,5 +1,6 @@
 """Module to link performers to galleries in Stash based on file paths, linked scenes, and StashDB queries."""
 
+import logging
 import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -8,10 +9,40 @@ import stashapi.log as logger
 import util
 from stashapi.stashapp import StashInterface
 
+try:
+    import ahocorasick
+
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 
 class PerformerGalleryLinker:
     """A class that provides methods to link performers to galleries in Stash."""
 
+    GALLERY_FRAGMENT = """
+        id
+        title
+        files {
+            path
+        }
+        performers {
+            id
+            name
+        }
+        scenes {
+            id
+            title
+            performers {
+                id
+                name
+            }
+        }
+    """
+
+    # Galleries fetched per page when streaming a full-library run.
+    GALLERY_PAGE_SIZE = 500
+
     def __init__(self, stash_interface: StashInterface):
         """
         Initialize the linker with a Stash interface.
@@ -21,6 +52,9 @@ class PerformerGalleryLinker:
         """
         self.stash = stash_interface
         self.logger = logger
+        # Checked once so hot loops skip building debug f-strings when the
+        # logger would drop them anyway.
+        self._debug_enabled = logger.sl.level <= logging.DEBUG
 
     def link_performers_to_galleries(
         self,
@@ -53,15 +87,23 @@ class PerformerGalleryLinker:
             - 'skipped': List of skipped items with reasons
         """
         results: Dict[str, Any] = {"linked": [], "created": [], "errors": [], "skipped": []}
+        # (update_input, linked_records) pairs queued during matching and
+        # flushed in chunked galleriesUpdate mutations, so the number of write
+        # round trips is ceil(N / UPDATE_BATCH_SIZE) instead of N.
+        pending_updates: List[Any] = []
 
         self.logger.info("Starting performer-gallery linking process")
 
         try:
-            # Get galleries to process
-            galleries = self._get_galleries_to_process(gallery_ids)
-            if not galleries:
-                results["errors"].append("No galleries found to process")
-                return results
+            # Get galleries to process. Full-library runs stream page by page
+            # so only one page of gallery dicts is alive at a time.
+            if gallery_ids:
+                galleries: Any = self._get_galleries_to_process(gallery_ids)
+                if not galleries:
+                    results["errors"].append("No galleries found to process")
+                    return results
+            else:
+                galleries = self._iter_galleries(results=results)
 
             # Get all performers for matching
             all_performers = self._get_performers_to_consider(performer_ids)
@@ -69,7 +111,11 @@ class PerformerGalleryLinker:
                 results["errors"].append("No performers found and create_missing is disabled")
                 return results
 
-            self.logger.info(f"Processing {len(galleries)} galleries against {len(all_performers)} performers")
+            self.logger.info(f"Processing galleries against {len(all_performers)} performers")
+
+            # Lowercased names/aliases (and the multi-pattern automaton when
+            # available) are built once here and reused for every gallery.
+            performer_index = self._build_performer_index(all_performers)
 
             # Get or create the "Gallery Linker: New Performer" tag if needed
             # new_performer_tag_id = None
@@ -77,7 +123,9 @@ class PerformerGalleryLinker:
             #     new_performer_tag_id = self._get_or_create_tag("Gallery Linker: New Performer", dry_run)
 
             # Process each gallery
+            galleries_processed = 0
             for gallery in galleries:
+                galleries_processed += 1
                 try:
                     gallery_id = gallery["id"]
                     # gallery_title = gallery.get("title", gallery.get("file", "Unknown"))
@@ -86,14 +134,17 @@ class PerformerGalleryLinker:
                     )
                     gallery_path = self._get_gallery_path(gallery)
 
-                    self.logger.debug(f"Processing gallery {gallery_id}: {gallery_title}")
+                    if self._debug_enabled:
+                        self.logger.debug(f"Processing gallery {gallery_id}: {gallery_title}")
 
                     # Skip if gallery already has performers (unless we want to add more)
                     existing_performers = gallery.get("performers", [])
                     existing_performer_ids = {str(p["id"]) for p in existing_performers}
 
                     # Strategy 1: Parse folder/file names for performer names
-                    name_matches = self._find_performers_from_names(gallery_title, gallery_path, all_performers)
+                    name_matches = self._find_performers_from_names(
+                        gallery_title, gallery_path, all_performers, performer_index
+                    )
 
                     # Strategy 2: Get performers from linked scenes
                     scene_performers = self._get_performers_from_linked_scenes(gallery)
@@ -129,40 +180,48 @@ class PerformerGalleryLinker:
                         )
                         continue
 
-                    # Link performers to gallery
-                    for performer_id, match in new_matches.items():
-                        link_result = self._link_performer_to_gallery(performer_id, gallery_id, dry_run=dry_run)
-
-                        if link_result["success"]:
-                            results["linked"].append(
-                                {
-                                    "gallery_id": gallery_id,
-                                    "gallery_title": gallery_title,
-                                    "gallery_path": gallery_path,
-                                    "performer_id": performer_id,
-                                    "performer_name": match.get("name", "Unknown"),
-                                    "match_score": match.get("match_score", 0),
-                                    "match_source": match.get("match_source", "unknown"),
-                                    "dry_run": dry_run,
-                                }
-                            )
-                        else:
-                            results["errors"].append(
-                                {
-                                    "gallery_id": gallery_id,
-                                    "performer_id": performer_id,
-                                    "error": link_result["error"],
-                                }
-                            )
+                    # Queue one update per gallery with the merged id set. The
+                    # merged ids come from the already-fetched gallery, so
+                    # there is no refetch and no per-performer mutation.
+                    merged_ids = sorted(int(pid) for pid in existing_performer_ids | set(new_matches))
+                    update = {"id": int(gallery_id), "performer_ids": merged_ids}
+                    records = [
+                        {
+                            "gallery_id": gallery_id,
+                            "gallery_title": gallery_title,
+                            "gallery_path": gallery_path,
+                            "performer_id": performer_id,
+                            "performer_name": match.get("name", "Unknown"),
+                            "match_score": match.get("match_score", 0),
+                            "match_source": match.get("match_source", "unknown"),
+                            "dry_run": dry_run,
+                        }
+                        for performer_id, match in new_matches.items()
+                    ]
+                    pending_updates.append((update, records))
 
                 except Exception as e:
                     results["errors"].append(
                         {"gallery_id": gallery.get("id", "unknown"), "error": f"Error processing gallery: {str(e)}"}
                     )
 
+                if not dry_run and len(pending_updates) >= self.UPDATE_BATCH_SIZE:
+                    self._flush_gallery_updates(pending_updates, results)
+                    pending_updates.clear()
+
+            if not galleries_processed:
+                results["errors"].append("No galleries found to process")
+                return results
+
+            if dry_run:
+                for _, records in pending_updates:
+                    results["linked"].extend(records)
+            else:
+                self._flush_gallery_updates(pending_updates, results)
+
             self.logger.info(
-                f"Linking complete: {len(results['linked'])} linked, "
-                f"{len(results['created'])} created, "
+                f"Linking complete: {galleries_processed} galleries processed, "
+                f"{len(results['linked'])} linked, {len(results['created'])} created, "
                 f"{len(results['errors'])} errors, {len(results['skipped'])} skipped"
             )
 
@@ -171,35 +230,92 @@ class PerformerGalleryLinker:
 
         return results
 
+    # Galleries per galleriesUpdate mutation when flushing queued links.
+    UPDATE_BATCH_SIZE = 100
+
+    def _flush_gallery_updates(self, pending_updates: List[Any], results: Dict[str, Any]) -> None:
+        """
+        Apply queued gallery performer updates in chunked galleriesUpdate mutations.
+
+        Args:
+            pending_updates: (update_input, linked_records) pairs from the matching loop
+            results: Results dictionary to record linked pairs and errors into
+        """
+        query = """
+        mutation GalleriesUpdate($input: [GalleryUpdateInput!]!) {
+            galleriesUpdate(input: $input) {
+                id
+            }
+        }
+        """
+        for start in range(0, len(pending_updates), self.UPDATE_BATCH_SIZE):
+            chunk = pending_updates[start : start + self.UPDATE_BATCH_SIZE]
+            try:
+                self.stash.call_GQL(query, {"input": [update for update, _ in chunk]})
+            except Exception as e:
+                # One bad input fails the whole mutation; retry the chunk one
+                # gallery at a time so the rest of it still lands.
+                self.logger.warning(f"Batch update failed, retrying galleries individually: {str(e)}")
+                for update, records in chunk:
+                    single = self._update_gallery_performers(str(update["id"]), update["performer_ids"])
+                    if single.get("success"):
+                        results["linked"].extend(records)
+                    else:
+                        results["errors"].append(
+                            {
+                                "gallery_id": str(update["id"]),
+                                "performer_ids": [record["performer_id"] for record in records],
+                                "error": single.get("error", "Gallery update failed"),
+                            }
+                        )
+                continue
+            for _, records in chunk:
+                results["linked"].extend(records)
+
+    def _iter_galleries(self, page_size: int = GALLERY_PAGE_SIZE, results: Optional[Dict[str, Any]] = None):
+        """
+        Yield all galleries page by page.
+
+        Keeps peak memory independent of gallery count: each page of gallery
+        dicts becomes garbage once the processing loop moves past it.
+
+        Args:
+            page_size: Number of galleries fetched per request
+            results: Optional results dictionary; a mid-stream fetch failure
+                is recorded in its 'errors' so truncated runs are visible
+
+        Yields:
+            Gallery dictionaries
+        """
+        page = 1
+        while True:
+            try:
+                batch = self.stash.find_galleries(
+                    f={}, filter={"per_page": page_size, "page": page}, fragment=self.GALLERY_FRAGMENT
+                )
+            except Exception as e:
+                self.logger.error(f"Error getting galleries page {page}: {str(e)}")
+                if results is not None:
+                    results["errors"].append(
+                        f"Gallery page {page} fetch failed, run covered only the galleries streamed so far: {str(e)}"
+                    )
+                return
+            if not isinstance(batch, list) or not batch:
+                return
+            yield from batch
+            if len(batch) < page_size:
+                return
+            page += 1
+
     def _get_galleries_to_process(self, gallery_ids: Optional[List[str]] = None) -> List[Dict]:
         """Get galleries to process based on provided IDs or all galleries."""
         try:
-            fragment = """
-                id
-                title
-                files {
-                    path
-                }
-                performers {
-                    id
-                    name
-                }
-                scenes {
-                    id
-                    title
-                    performers {
-                        id
-                        name
-                    }
-                }
-            """
-
             if gallery_ids:
                 galleries = []
                 for gallery_id in gallery_ids:
                     try:
                         gallery_id_int = int(gallery_id)
-                        gallery = self.stash.find_gallery(gallery_id_int, fragment=fragment)
+                        gallery = self.stash.find_gallery(gallery_id_int, fragment=self.GALLERY_FRAGMENT)
                         if gallery:
                             galleries.append(gallery)
                         else:
@@ -209,7 +325,9 @@ class PerformerGalleryLinker:
                 return galleries
             else:
                 # Get all galleries
-                galleries_result = self.stash.find_galleries(f={}, filter={"per_page": -1}, fragment=fragment)
+                galleries_result = self.stash.find_galleries(
+                    f={}, filter={"per_page": -1}, fragment=self.GALLERY_FRAGMENT
+                )
                 return galleries_result if isinstance(galleries_result, list) else []
         except Exception as e:
             self.logger.error(f"Error getting galleries: {str(e)}")
@@ -249,8 +367,45 @@ class PerformerGalleryLinker:
             self.logger.error(f"Error getting performers: {str(e)}")
             return []
 
+    def _build_performer_index(self, all_performers: List[Dict]) -> Dict[str, Any]:
+        """
+        Precompute lowercase performer needles and an optional multi-pattern automaton.
+
+        With pyahocorasick installed, every performer name and alias goes into
+        one Aho-Corasick automaton, so the exact-substring checks for a
+        gallery become a single pass over its search text instead of one scan
+        per performer.
+
+        Args:
+            all_performers: List of all available performers
+
+        Returns:
+            Index dictionary consumed by _find_performers_from_names
+        """
+        prepped = []
+        for performer in all_performers:
+            name_lower = (performer.get("name") or "").lower()
+            aliases_lower = [alias.lower() for alias in performer.get("alias_list") or [] if alias]
+            prepped.append((performer, name_lower, aliases_lower))
+
+        automaton = None
+        if HAS_AHOCORASICK and prepped:
+            automaton = ahocorasick.Automaton()
+            for idx, (_, name_lower, aliases_lower) in enumerate(prepped):
+                if name_lower:
+                    automaton.add_word(name_lower, (idx, "name_parsing"))
+                for alias in aliases_lower:
+                    automaton.add_word(alias, (idx, "alias_parsing"))
+            automaton.make_automaton()
+
+        return {"prepped": prepped, "automaton": automaton}
+
     def _find_performers_from_names(
-        self, gallery_title: str, gallery_path: str, all_performers: List[Dict]
+        self,
+        gallery_title: str,
+        gallery_path: str,
+        all_performers: List[Dict],
+        performer_index: Optional[Dict[str, Any]] = None,
     ) -> List[Dict]:
         """
         Find performers by parsing folder/file names.
@@ -259,21 +414,40 @@ class PerformerGalleryLinker:
             gallery_title: Gallery title
             gallery_path: Gallery file path
             all_performers: List of all available performers
+            performer_index: Optional precomputed index from _build_performer_index
 
         Returns:
             List of matching performers with match scores
         """
+        if performer_index is None:
+            performer_index = self._build_performer_index(all_performers)
+
         matches = []
+        matched_idx = set()
 
         # Extract searchable text from title and path
         search_text = self._extract_searchable_text(gallery_title, gallery_path)
 
-        for performer in all_performers:
-            performer_name = performer.get("name", "")
-            aliases = performer.get("alias_list", []) or []
+        # Fast path: one automaton pass finds every exact name/alias substring.
+        automaton = performer_index["automaton"]
+        prepped = performer_index["prepped"]
+        if automaton is not None:
+            for _, (idx, match_source) in automaton.iter(search_text):
+                if idx in matched_idx:
+                    continue
+                matched_idx.add(idx)
+                match = prepped[idx][0].copy()
+                match["match_score"] = 1.0
+                match["match_source"] = match_source
+                matches.append(match)
+
+        # Word-overlap scoring for performers the exact pass didn't catch.
+        for idx, (performer, name_lower, aliases_lower) in enumerate(prepped):
+            if idx in matched_idx:
+                continue
 
             # Check name match
-            score = self._calculate_name_match_score(search_text, performer_name)
+            score = self._calculate_name_match_score(search_text, name_lower)
             if score > 0.7:
                 match = performer.copy()
                 match["match_score"] = score
@@ -282,7 +456,7 @@ class PerformerGalleryLinker:
                 continue
 
             # Check alias matches
-            for alias in aliases:
+            for alias in aliases_lower:
                 score = self._calculate_name_match_score(search_text, alias)
                 if score > 0.7:
                     match = performer.copy()
@@ -361,8 +535,8 @@ class PerformerGalleryLinker:
         Calculate match score between search text and performer name.
 
         Args:
-            search_text: Text to search in
-            performer_name: Performer name to match
+            search_text: Text to search in (lowercase)
+            performer_name: Performer name to match, already lowercased by the caller
 
         Returns:
             Match score between 0 and 1
@@ -370,7 +544,7 @@ class PerformerGalleryLinker:
         if not search_text or not performer_name:
             return 0.0
 
-        performer_name_lower = performer_name.lower()
+        performer_name_lower = performer_name
 
         # Exact match
         if performer_name_lower in search_text:
@@ -385,10 +559,6 @@ class PerformerGalleryLinker:
 
         # Calculate word overlap
         intersection = search_words.intersection(name_words)
-        union = search_words.union(name_words)
-
-        if not union:
-            return 0.0
 
         return len(intersection) / len(name_words)  # Score based on name word coverage
 
@@ -399,13 +569,15 @@ class PerformerGalleryLinker:
             return str(files[0].get("path", ""))
         return ""
 
-    def _link_performer_to_gallery(self, performer_id: str, gallery_id: str, dry_run: bool = False) -> Dict[str, Any]:
+    def _update_gallery_performers(
+        self, gallery_id: str, performer_ids: List[int], dry_run: bool = False
+    ) -> Dict[str, Any]:
         """
-        Perform the actual linking of a performer to a gallery.
+        Set the full performer list of a gallery in a single mutation.
 
         Args:
-            performer_id: ID of the performer to link
-            gallery_id: ID of the gallery to link to
+            gallery_id: ID of the gallery to update
+            performer_ids: Complete list of performer IDs the gallery should have
             dry_run: If True, don't actually perform the operation
 
         Returns:
@@ -415,59 +587,22 @@ class PerformerGalleryLinker:
             return {"success": True, "dry_run": True}
 
         try:
-            # Get current gallery data to preserve existing performers
-            gallery_id_int = int(gallery_id)
-            current_gallery = self.stash.find_gallery(gallery_id_int, fragment="performers { id }")
-            if not current_gallery:
-                return {"success": False, "error": "Gallery not found"}
-
-            # Get current performer IDs and add the new one
-            current_performer_ids = [int(p["id"]) for p in current_gallery.get("performers", [])]
-            performer_id_int = int(performer_id)
-            if performer_id_int not in current_performer_ids:
-                current_performer_ids.append(performer_id_int)
-
-            # Use GraphQL mutation to update gallery
-            update_data = {"id": gallery_id_int, "performer_ids": current_performer_ids}
-
-            try:
-                if hasattr(self.stash, "call_GQL"):
-                    query = """
-                    mutation GalleryUpdate($input: GalleryUpdateInput!) {
-                        galleryUpdate(input: $input) {
-                            id
-                            performers {
-                                id
-                                name
-                            }
-                        }
-                    }
-                    """
-                    variables = {"input": update_data}
-                    result = self.stash.call_GQL(query, variables)
-
-                    if result and "galleryUpdate" in result.get("data", {}):
-                        self.logger.info(f"Successfully linked performer {performer_id} to gallery {gallery_id}")
-                        return {"success": True}
-                    else:
-                        return {"success": False, "error": "GraphQL mutation failed"}
-                else:
-                    # Fallback: Log the operation
-                    self.logger.warning("Direct GraphQL update not available. This is a demo implementation.")
-                    self.logger.info(
-                        f"Would link performer {performer_id} to gallery {gallery_id} with data: {update_data}"
-                    )
-                    return {"success": True, "demo_mode": True}
+            query = """
+            mutation GalleryUpdate($input: GalleryUpdateInput!) {
+                galleryUpdate(input: $input) {
+                    id
+                }
+            }
+            """
+            variables = {"input": {"id": int(gallery_id), "performer_ids": performer_ids}}
+            result = self.stash.call_GQL(query, variables)
 
-            except AttributeError:
-                self.logger.warning("GraphQL update method not available. This is a demo implementation.")
-                self.logger.info(
-                    f"Would link performer {performer_id} to gallery {gallery_id} with data: {update_data}"
-                )
-                return {"success": True, "demo_mode": True}
+            if result and "galleryUpdate" in result.get("data", result):
+                return {"success": True}
+            return {"success": False, "error": "GraphQL mutation failed"}
 
         except Exception as e:
-            error_msg = f"Failed to link performer to gallery: {str(e)}"
+            error_msg = f"Failed to update gallery performers: {str(e)}"
             self.logger.error(error_msg)
             return {"success": False, "error": error_msg}
 
@@ -1,16 +1,83 @@
 """Module to link scenes to galleries in Stash based on file paths and naming conventions."""
 
+import heapq
+import logging
+import os
+import pickle
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import stashapi.log as logger
 from stashapi.stashapp import StashInterface
 
+try:
+    from GalleryLinker import scoring, util
+    from GalleryLinker.datatypes import DEFAULT_SCORING_CONFIG, MatchResult, ScoringConfig
+except ImportError:
+    import scoring
+    import util
+    from datatypes import DEFAULT_SCORING_CONFIG, MatchResult, ScoringConfig
+
+
+def _parse_date_ordinal(raw: Optional[str]) -> int:
+    """Parse a YYYY-MM-DD date string to its proleptic ordinal, or -1 if unset/invalid."""
+    if not raw:
+        return -1
+    try:
+        year, month, day = raw[:10].split("-")
+        return date(int(year), int(month), int(day)).toordinal()
+    except (ValueError, TypeError):
+        return -1
+
+
+def _entity_date_ordinal(entity: Dict) -> int:
+    """Date ordinal for a scene or gallery, falling back to a date embedded in its filename."""
+    ordinal = _parse_date_ordinal(entity.get("date"))
+    if ordinal < 0:
+        files = entity.get("files", [])
+        if files and files[0].get("path"):
+            ordinal = _parse_date_ordinal(util.extract_date_from_filename(os.path.basename(files[0]["path"])))
+    return ordinal
+
 
 class SceneGalleryLinker:
     """A class that provides methods to link scenes to galleries in Stash."""
 
+    SCENE_FRAGMENT = """
+        id
+        title
+        date
+        files {
+            path
+        }
+        galleries {
+            id
+            title
+        }
+        performers {
+            id
+        }
+    """
+
+    GALLERY_FRAGMENT = """
+        id
+        title
+        date
+        updated_at
+        files {
+            path
+        }
+        scenes {
+            id
+        }
+        performers {
+            id
+        }
+    """
+
     def __init__(self, stash_interface: StashInterface):
         """
         Initialize the linker with a Stash interface.
@@ -20,6 +87,13 @@ class SceneGalleryLinker:
         """
         self.stash = stash_interface
         self.logger = logger
+        # Checked once so hot loops skip building debug f-strings when the
+        # logger would drop them anyway.
+        self._debug_enabled = logger.sl.level <= logging.DEBUG
+        # Normalized gallery titles, keyed by (id, updated_at) so stale
+        # entries are ignored after a gallery changes. Reused across repeated
+        # link_scenes_to_galleries_by_path calls on the same instance.
+        self._norm_title_cache: Dict[Any, str] = {}
 
     def link_scenes_to_galleries_by_path(
         self,
@@ -49,6 +123,10 @@ class SceneGalleryLinker:
             - 'skipped': List of skipped items with reasons
         """
         results: Dict[str, Any] = {"linked": [], "errors": [], "skipped": []}
+        # (update_input, linked_records) pairs queued during matching and
+        # flushed in chunked scenesUpdate mutations afterwards, so the number
+        # of write round trips is ceil(N / UPDATE_BATCH_SIZE) instead of N.
+        pending_updates: List[Any] = []
 
         if link_strategy not in ["path_proximity", "name_similarity", "directory_match", "add_additional"]:
             results["errors"].append(f"Invalid link strategy: {link_strategy}")
@@ -57,84 +135,84 @@ class SceneGalleryLinker:
         self.logger.info(f"Starting linking process with strategy: {link_strategy}")
 
         try:
-            # Get scenes to process
-            scenes = self._get_scenes_to_process(scene_ids)
-            if not scenes:
-                results["errors"].append("No scenes found to process")
+            if scene_ids is None and gallery_ids is None and link_strategy == "name_similarity":
+                # Full-library name matching runs gallery-driven through the
+                # scene index: the trigram/date/performer prefilter hands each
+                # gallery a bounded candidate set, so matching is O(G * k)
+                # instead of scoring every (scene, gallery) pair.
+                galleries = self._get_galleries_to_consider(None)
+                if not galleries:
+                    results["errors"].append("No galleries found to consider")
+                    return results
+
+                scene_index = self.get_scene_index()
+                total_scenes = len(scene_index["scenes"])
+                if total_scenes == 0:
+                    results["errors"].append("No scenes found to process")
+                    return results
+
+                self._queue_indexed_matches(galleries, scene_index, dry_run, results, pending_updates)
+
+                if dry_run:
+                    for _, records in pending_updates:
+                        results["linked"].extend(records)
+                else:
+                    self._flush_scene_updates(pending_updates, results)
+
+                self.logger.info(
+                    f"Linking complete: {total_scenes} scenes against {len(galleries)} galleries, "
+                    f"{len(results['linked'])} linked, "
+                    f"{len(results['errors'])} errors, {len(results['skipped'])} skipped"
+                )
                 return results
 
-            # Get galleries to consider
-            galleries = self._get_galleries_to_consider(gallery_ids)
+            if scene_ids is None and gallery_ids is None:
+                # Full-library run: one aliased round trip fetches all
+                # galleries plus the first scene page, then further scene
+                # pages stream so only one page of scene dicts is alive at a
+                # time. Unless links are being added to already-linked scenes,
+                # the server filters out scenes that have galleries, so they
+                # never cross the wire.
+                scene_filter = None if link_strategy == "add_additional" else util.FILTERS.null_galleries()
+                first_scenes, galleries = self._fetch_scenes_and_galleries(
+                    scene_page_size=self.SCENE_PAGE_SIZE, scene_filter=scene_filter
+                )
+                scene_batches: Any = self._iter_scene_pages(first_scenes, scene_filter=scene_filter, results=results)
+                # Flushing mid-stream would drop newly linked scenes out of
+                # the filtered result set and shift the pages still being
+                # fetched, so writes wait until the stream is done.
+                defer_flush = scene_filter is not None
+            else:
+                scenes = self._get_scenes_to_process(scene_ids)
+                galleries = self._get_galleries_to_consider(gallery_ids)
+                scene_batches = [scenes] if scenes else []
+                defer_flush = False
+
             if not galleries:
                 results["errors"].append("No galleries found to consider")
                 return results
 
-            self.logger.info(f"Processing {len(scenes)} scenes against {len(galleries)} galleries")
+            total_scenes = 0
+            for scene_batch in scene_batches:
+                total_scenes += len(scene_batch)
+                self._process_scene_batch(scene_batch, galleries, link_strategy, dry_run, results, pending_updates)
+                if not dry_run and not defer_flush and len(pending_updates) >= self.UPDATE_BATCH_SIZE:
+                    self._flush_scene_updates(pending_updates, results)
+                    pending_updates.clear()
 
-            # Process each scene
-            for scene in scenes:
-                try:
-                    # Skip if scene already has galleries (unless we want to add more)
-                    existing_galleries = scene.get("galleries", [])
-                    if existing_galleries and link_strategy != "add_additional":
-                        self.logger.debug(
-                            f"Skipping scene {scene['id']} - already linked to galleries {[g['id'] for g in existing_galleries]}"
-                        )
-                        results["skipped"].append(
-                            {
-                                "scene_id": scene["id"],
-                                "scene_title": scene.get("title", "Unknown"),
-                                "reason": f"Scene already linked to {len(existing_galleries)} galleries",
-                            }
-                        )
-                        continue
-
-                    # Find potential gallery matches for this scene
-                    gallery_matches = self._find_gallery_matches(scene, galleries, link_strategy)
-
-                    if not gallery_matches:
-                        results["skipped"].append(
-                            {
-                                "scene_id": scene["id"],
-                                "scene_title": scene.get("title", "Unknown"),
-                                "reason": "No matching galleries found",
-                            }
-                        )
-                        continue
+            if total_scenes == 0:
+                results["errors"].append("No scenes found to process")
+                return results
 
-                    # Link to the best match (or multiple matches based on strategy)
-                    for gallery in gallery_matches:
-                        # Skip if already linked
-                        if self._is_scene_linked_to_gallery(scene["id"], gallery["id"]):
-                            continue
-
-                        link_result = self._link_scene_to_gallery(scene["id"], gallery["id"], dry_run=dry_run)
-
-                        if link_result["success"]:
-                            results["linked"].append(
-                                {
-                                    "scene_id": scene["id"],
-                                    "scene_title": scene.get("title", "Unknown"),
-                                    "scene_path": self._get_scene_path(scene),
-                                    "gallery_id": gallery["id"],
-                                    "gallery_title": gallery.get("title", "Unknown"),
-                                    "gallery_path": self._get_gallery_path(gallery),
-                                    "match_score": gallery.get("match_score", 0),
-                                    "dry_run": dry_run,
-                                }
-                            )
-                        else:
-                            results["errors"].append(
-                                {"scene_id": scene["id"], "gallery_id": gallery["id"], "error": link_result["error"]}
-                            )
-
-                except Exception as e:
-                    results["errors"].append(
-                        {"scene_id": scene.get("id", "unknown"), "error": f"Error processing scene: {str(e)}"}
-                    )
+            if dry_run:
+                for _, records in pending_updates:
+                    results["linked"].extend(records)
+            else:
+                self._flush_scene_updates(pending_updates, results)
 
             self.logger.info(
-                f"Linking complete: {len(results['linked'])} linked, "
+                f"Linking complete: {total_scenes} scenes against {len(galleries)} galleries, "
+                f"{len(results['linked'])} linked, "
                 f"{len(results['errors'])} errors, {len(results['skipped'])} skipped"
             )
 
@@ -143,6 +221,257 @@ class SceneGalleryLinker:
 
         return results
 
+    def _process_scene_batch(
+        self,
+        scenes: List[Dict],
+        galleries: List[Dict],
+        link_strategy: str,
+        dry_run: bool,
+        results: Dict[str, Any],
+        pending_updates: List[Any],
+    ) -> None:
+        """Match one batch of scenes against the galleries and queue their link updates."""
+        # Skip scenes that already have galleries (unless we want to add more)
+        scenes_to_match = []
+        for scene in scenes:
+            existing_galleries = scene.get("galleries", [])
+            if existing_galleries and link_strategy != "add_additional":
+                if self._debug_enabled:
+                    self.logger.debug(
+                        f"Skipping scene {scene['id']} - already linked to galleries "
+                        f"{[g['id'] for g in existing_galleries]}"
+                    )
+                results["skipped"].append(
+                    {
+                        "scene_id": scene["id"],
+                        "scene_title": scene.get("title", "Unknown"),
+                        "reason": f"Scene already linked to {len(existing_galleries)} galleries",
+                    }
+                )
+            else:
+                scenes_to_match.append(scene)
+
+        # Matching is independent per scene; rapidfuzz releases the GIL
+        # during scoring, so a thread pool spreads the CPU-bound phase
+        # across cores. Without rapidfuzz the threads would just contend,
+        # so matching stays serial.
+        def match_one(scene: Dict) -> Any:
+            try:
+                return self._find_gallery_matches(scene, galleries, link_strategy)
+            except Exception as e:  # noqa: BLE001 - recorded per scene below
+                return e
+
+        if scoring.HAS_RAPIDFUZZ and len(scenes_to_match) > 1:
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, 8)) as executor:
+                all_matches = list(executor.map(match_one, scenes_to_match))
+        else:
+            all_matches = [match_one(scene) for scene in scenes_to_match]
+
+        # Process each scene
+        for scene, gallery_matches in zip(scenes_to_match, all_matches):
+            try:
+                existing_galleries = scene.get("galleries", [])
+                if isinstance(gallery_matches, Exception):
+                    raise gallery_matches
+
+                if not gallery_matches:
+                    results["skipped"].append(
+                        {
+                            "scene_id": scene["id"],
+                            "scene_title": scene.get("title", "Unknown"),
+                            "reason": "No matching galleries found",
+                        }
+                    )
+                    continue
+
+                # Queue links to the best matches; the already-fetched
+                # gallery list makes the duplicate check local instead of
+                # an API call per pair.
+                existing_ids = {str(g["id"]) for g in existing_galleries}
+                new_galleries = []
+                for gallery in gallery_matches:
+                    if str(gallery["id"]) in existing_ids:
+                        continue
+                    existing_ids.add(str(gallery["id"]))
+                    new_galleries.append(gallery)
+
+                if not new_galleries:
+                    results["skipped"].append(
+                        {
+                            "scene_id": scene["id"],
+                            "scene_title": scene.get("title", "Unknown"),
+                            "reason": "Matched galleries already linked",
+                        }
+                    )
+                    continue
+
+                update = {"id": int(scene["id"]), "gallery_ids": sorted(int(gid) for gid in existing_ids)}
+                records = [
+                    {
+                        "scene_id": scene["id"],
+                        "scene_title": scene.get("title", "Unknown"),
+                        "scene_path": self._get_scene_path(scene),
+                        "gallery_id": gallery["id"],
+                        "gallery_title": gallery.get("title", "Unknown"),
+                        "gallery_path": self._get_gallery_path(gallery),
+                        "match_score": gallery.get("match_score", 0),
+                        "dry_run": dry_run,
+                    }
+                    for gallery in new_galleries
+                ]
+                pending_updates.append((update, records))
+
+            except Exception as e:
+                results["errors"].append(
+                    {"scene_id": scene.get("id", "unknown"), "error": f"Error processing scene: {str(e)}"}
+                )
+
+    # A scene links to at most this many galleries per run, mirroring the
+    # per-scene cap of the strategy-based matcher.
+    MAX_GALLERIES_PER_SCENE = 3
+
+    def _queue_indexed_matches(
+        self,
+        galleries: List[Dict],
+        scene_index: Dict[str, Any],
+        dry_run: bool,
+        results: Dict[str, Any],
+        pending_updates: List[Any],
+    ) -> None:
+        """
+        Match galleries against the scene index and queue per-scene link updates.
+
+        Each gallery is matched independently through find_matching_scenes,
+        then the per-gallery results are inverted into one queued update per
+        scene carrying all of its matched galleries.
+
+        Args:
+            galleries: Gallery dictionaries to match
+            scene_index: Index from _build_scene_index
+            dry_run: Propagated into the queued link records
+            results: Results dictionary to record skips and errors into
+            pending_updates: (update_input, linked_records) list to append to
+        """
+
+        # Matching is independent per gallery; rapidfuzz releases the GIL
+        # during scoring, so a thread pool spreads the CPU-bound phase across
+        # cores (same trade-off as the per-scene strategy matcher).
+        def match_one(gallery: Dict) -> Any:
+            try:
+                return self.find_matching_scenes(gallery, scene_index)
+            except Exception as e:  # noqa: BLE001 - recorded per gallery below
+                return e
+
+        if scoring.HAS_RAPIDFUZZ and len(galleries) > 1:
+            with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, 8)) as executor:
+                all_matches = list(executor.map(match_one, galleries))
+        else:
+            all_matches = [match_one(gallery) for gallery in galleries]
+
+        # Invert gallery-driven matches to per-scene accumulation so a scene
+        # matched by several galleries still gets a single update.
+        matched: Dict[str, List[Tuple[float, Dict]]] = {}
+        for gallery, scene_matches in zip(galleries, all_matches):
+            if isinstance(scene_matches, Exception):
+                results["errors"].append(
+                    {
+                        "gallery_id": gallery.get("id", "unknown"),
+                        "error": f"Error matching gallery: {str(scene_matches)}",
+                    }
+                )
+                continue
+            for match in scene_matches:
+                matched.setdefault(str(match.scene["id"]), []).append((match.score, gallery))
+
+        for scene in scene_index["scenes"]:
+            existing_galleries = scene.get("galleries", [])
+            if existing_galleries:
+                results["skipped"].append(
+                    {
+                        "scene_id": scene["id"],
+                        "scene_title": scene.get("title", "Unknown"),
+                        "reason": f"Scene already linked to {len(existing_galleries)} galleries",
+                    }
+                )
+                continue
+
+            gallery_scores = matched.get(str(scene["id"]))
+            if not gallery_scores:
+                results["skipped"].append(
+                    {
+                        "scene_id": scene["id"],
+                        "scene_title": scene.get("title", "Unknown"),
+                        "reason": "No matching galleries found",
+                    }
+                )
+                continue
+
+            gallery_scores.sort(key=lambda pair: pair[0], reverse=True)
+            existing_ids = set()
+            new_galleries = []
+            for score, gallery in gallery_scores:
+                if str(gallery["id"]) in existing_ids:
+                    continue
+                existing_ids.add(str(gallery["id"]))
+                new_galleries.append((score, gallery))
+                if len(new_galleries) >= self.MAX_GALLERIES_PER_SCENE:
+                    break
+
+            update = {"id": int(scene["id"]), "gallery_ids": sorted(int(gid) for gid in existing_ids)}
+            records = [
+                {
+                    "scene_id": scene["id"],
+                    "scene_title": scene.get("title", "Unknown"),
+                    "scene_path": self._get_scene_path(scene),
+                    "gallery_id": gallery["id"],
+                    "gallery_title": gallery.get("title", "Unknown"),
+                    "gallery_path": self._get_gallery_path(gallery),
+                    "match_score": score,
+                    "dry_run": dry_run,
+                }
+                for score, gallery in new_galleries
+            ]
+            pending_updates.append((update, records))
+
+    # Scenes per scenesUpdate mutation when flushing queued links.
+    UPDATE_BATCH_SIZE = 100
+
+    def _flush_scene_updates(self, pending_updates: List[Any], results: Dict[str, Any]) -> None:
+        """
+        Apply queued scene updates in chunked scenesUpdate mutations.
+
+        Args:
+            pending_updates: (update_input, linked_records) pairs from the matching loop
+            results: Results dictionary to record linked pairs and errors into
+        """
+        query = """
+        mutation ScenesUpdate($input: [SceneUpdateInput!]!) {
+            scenesUpdate(input: $input) {
+                id
+            }
+        }
+        """
+        for start in range(0, len(pending_updates), self.UPDATE_BATCH_SIZE):
+            chunk = pending_updates[start : start + self.UPDATE_BATCH_SIZE]
+            try:
+                self.stash.call_GQL(query, {"input": [update for update, _ in chunk]})
+            except Exception as e:
+                # One bad input fails the whole mutation; retry the chunk one
+                # scene at a time so the rest of it still lands.
+                self.logger.warning(f"Batch update failed, retrying scenes individually: {str(e)}")
+                for update, records in chunk:
+                    try:
+                        self.stash.call_GQL(query, {"input": [update]})
+                    except Exception as single_error:
+                        results["errors"].append(
+                            {"scene_id": str(update["id"]), "error": f"Scene update failed: {str(single_error)}"}
+                        )
+                    else:
+                        results["linked"].extend(records)
+                continue
+            for _, records in chunk:
+                results["linked"].extend(records)
+
     def link_scene_to_gallery_by_ids(self, scene_id: str, gallery_id: str, dry_run: bool = False) -> Dict[str, Any]:
         """
         Link a specific scene to a specific gallery by their IDs.
@@ -187,37 +516,99 @@ class SceneGalleryLinker:
         except Exception as e:
             return {"success": False, "error": f"Exception during linking: {str(e)}"}
 
-    def _get_scenes_to_process(self, scene_ids: Optional[List[str]] = None) -> List[Dict]:
-        """Get scenes to process based on provided IDs or all scenes."""
+    # Scenes fetched per page when streaming a full-library run.
+    SCENE_PAGE_SIZE = 500
+
+    def _fetch_scenes_and_galleries(
+        self, scene_page_size: int = -1, scene_filter: Optional[Dict] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Fetch scenes and all galleries in one aliased GraphQL round trip.
+
+        Args:
+            scene_page_size: Scenes to include in the combined query; -1 fetches
+                all scenes, a positive value fetches only the first page so the
+                rest can stream via _iter_scene_pages
+            scene_filter: Optional SceneFilterType dict applied server-side
+
+        Returns:
+            (scenes, galleries) tuple; both empty on query failure
+        """
         try:
-            fragment = """
-                id
-                title
-                files {
-                    path
-                }
-                galleries {
-                    id
-                    title
-                }
+            query = f"""
+            query ScenesAndGalleries($scene_filter: SceneFilterType) {{
+                scenes: findScenes(scene_filter: $scene_filter, filter: {{per_page: {scene_page_size}, page: 1}}) {{
+                    scenes {{ {self.SCENE_FRAGMENT} }}
+                }}
+                galleries: findGalleries(filter: {{per_page: -1}}) {{
+                    galleries {{ {self.GALLERY_FRAGMENT} }}
+                }}
+            }}
             """
+            result = self.stash.call_GQL(query, {"scene_filter": scene_filter})
+            data = result.get("data", result) if result else {}
+            scenes = data.get("scenes", {}).get("scenes", [])
+            galleries = data.get("galleries", {}).get("galleries", [])
+            return list(scenes), list(galleries)
+        except Exception as e:
+            self.logger.error(f"Error getting scenes and galleries: {str(e)}")
+            return [], []
+
+    def _iter_scene_pages(
+        self, first_page: List[Dict], scene_filter: Optional[Dict] = None, results: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Yield scene pages starting from an already-fetched first page.
 
+        Keeps only one page of scene dicts alive at a time; a short or empty
+        page ends the stream.
+
+        Args:
+            first_page: Page 1 scenes from the combined fetch
+            scene_filter: Optional SceneFilterType dict matching the one used
+                for the first page
+            results: Optional results dictionary; a mid-stream fetch failure
+                is recorded in its 'errors' so truncated runs are visible
+
+        Yields:
+            Lists of scene dictionaries, SCENE_PAGE_SIZE scenes per page
+        """
+        if not first_page:
+            return
+        yield first_page
+        if len(first_page) < self.SCENE_PAGE_SIZE:
+            return
+
+        page = 2
+        while True:
+            try:
+                batch = self.stash.find_scenes(
+                    f=scene_filter or {},
+                    filter={"per_page": self.SCENE_PAGE_SIZE, "page": page},
+                    fragment=self.SCENE_FRAGMENT,
+                )
+            except Exception as e:
+                self.logger.error(f"Error fetching scene page {page}: {str(e)}")
+                if results is not None:
+                    results["errors"].append(
+                        f"Scene page {page} fetch failed, run covered only the scenes streamed so far: {str(e)}"
+                    )
+                return
+            if not isinstance(batch, list) or not batch:
+                return
+            yield batch
+            if len(batch) < self.SCENE_PAGE_SIZE:
+                return
+            page += 1
+
+    def _get_scenes_to_process(self, scene_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Get scenes to process based on provided IDs or all scenes."""
+        try:
             if scene_ids:
-                scenes = []
-                for scene_id in scene_ids:
-                    try:
-                        scene_id_int = int(scene_id)
-                        scene = self.stash.find_scene(scene_id_int, fragment=fragment)
-                        if scene:
-                            scenes.append(scene)
-                        else:
-                            self.logger.warning(f"Scene with ID {scene_id} not found")
-                    except (ValueError, TypeError):
-                        self.logger.warning(f"Invalid scene ID format: {scene_id}")
-                return scenes
+                return self._find_scenes_by_ids(scene_ids, self.SCENE_FRAGMENT)
             else:
                 # Get all scenes - use pagination for large libraries
-                scenes_result = self.stash.find_scenes(f={}, filter={"per_page": -1}, fragment=fragment)
+                scenes_result = self.stash.find_scenes(f={}, filter={"per_page": -1}, fragment=self.SCENE_FRAGMENT)
                 return scenes_result if isinstance(scenes_result, list) else []
         except Exception as e:
             self.logger.error(f"Error getting scenes: {str(e)}")
@@ -226,38 +617,72 @@ class SceneGalleryLinker:
     def _get_galleries_to_consider(self, gallery_ids: Optional[List[str]] = None) -> List[Dict]:
         """Get galleries to consider based on provided IDs or all galleries."""
         try:
-            fragment = """
-                id
-                title
-                files {
-                    path
-                }
-                scenes {
-                    id
-                }
-            """
-
             if gallery_ids:
-                galleries = []
-                for gallery_id in gallery_ids:
-                    try:
-                        gallery_id_int = int(gallery_id)
-                        gallery = self.stash.find_gallery(gallery_id_int, fragment=fragment)
-                        if gallery:
-                            galleries.append(gallery)
-                        else:
-                            self.logger.warning(f"Gallery with ID {gallery_id} not found")
-                    except (ValueError, TypeError):
-                        self.logger.warning(f"Invalid gallery ID format: {gallery_id}")
-                return galleries
+                return self._find_galleries_by_ids(gallery_ids, self.GALLERY_FRAGMENT)
             else:
                 # Get all galleries
-                galleries_result = self.stash.find_galleries(f={}, filter={"per_page": -1}, fragment=fragment)
+                galleries_result = self.stash.find_galleries(
+                    f={}, filter={"per_page": -1}, fragment=self.GALLERY_FRAGMENT
+                )
                 return galleries_result if isinstance(galleries_result, list) else []
         except Exception as e:
             self.logger.error(f"Error getting galleries: {str(e)}")
             return []
 
+    def _parse_int_ids(self, raw_ids: List[str], label: str) -> List[int]:
+        """Convert string IDs to ints, warning about any invalid entries."""
+        ids = []
+        for raw_id in raw_ids:
+            try:
+                ids.append(int(raw_id))
+            except (ValueError, TypeError):
+                self.logger.warning(f"Invalid {label} ID format: {raw_id}")
+        return ids
+
+    def _find_scenes_by_ids(self, scene_ids: List[str], fragment: str) -> List[Dict]:
+        """Fetch multiple scenes in one GraphQL round trip instead of one call per ID."""
+        ids = self._parse_int_ids(scene_ids, "scene")
+        if not ids:
+            return []
+
+        query = f"""
+        query FindScenesByIds($ids: [ID!]) {{
+            findScenes(ids: $ids, filter: {{per_page: -1}}) {{
+                scenes {{ {fragment} }}
+            }}
+        }}
+        """
+        result = self.stash.call_GQL(query, {"ids": ids})
+        data = result.get("data", result) if result else {}
+        scenes = data.get("findScenes", {}).get("scenes", [])
+        if len(scenes) < len(ids):
+            found_ids = {int(s["id"]) for s in scenes}
+            for missing in set(ids) - found_ids:
+                self.logger.warning(f"Scene with ID {missing} not found")
+        return list(scenes)
+
+    def _find_galleries_by_ids(self, gallery_ids: List[str], fragment: str) -> List[Dict]:
+        """Fetch multiple galleries in one GraphQL round trip instead of one call per ID."""
+        ids = self._parse_int_ids(gallery_ids, "gallery")
+        if not ids:
+            return []
+
+        query = f"""
+        query FindGalleriesByIds($ids: [ID!]) {{
+            findGalleries(ids: $ids, filter: {{per_page: -1}}) {{
+                galleries {{ {fragment} }}
+            }}
+        }}
+        """
+        result = self.stash.call_GQL(query, {"ids": ids})
+        data = result.get("data", result) if result else {}
+        galleries = data.get("findGalleries", {}).get("galleries", [])
+        if len(galleries) < len(ids):
+            found_ids = {int(g["id"]) for g in galleries}
+            for missing in set(ids) - found_ids:
+                self.logger.warning(f"Gallery with ID {missing} not found")
+        return list(galleries)
+
     def _find_gallery_matches(self, scene: Dict, galleries: List[Dict], strategy: str) -> List[Dict]:
         """
         Find galleries that match a scene based on the specified strategy.
@@ -273,6 +698,7 @@ class SceneGalleryLinker:
         matches = []
         scene_path = self._get_scene_path(scene)
         scene_title = scene.get("title", "")
+        scene_norm_title = scoring.normalize_title(scene_title)
         threshold = 0.50
 
         for gallery in galleries:
@@ -284,9 +710,9 @@ class SceneGalleryLinker:
                 match_score = self._calculate_path_proximity_score(scene_path, gallery_path)
                 threshold = 0.75
             elif strategy == "name_similarity":
-                if not gallery_title:
-                    gallery_title = self._extract_gallery_title_from_path(gallery_path)
-                match_score = self._calculate_name_similarity_score(scene_title, gallery_title)
+                match_score = scoring.string_similarity(
+                    scene_norm_title, self._gallery_norm_title(gallery), score_cutoff=0.50
+                )
                 threshold = 0.50
             elif strategy == "directory_match":
                 match_score = self._calculate_directory_match_score(scene_path, gallery_path)
@@ -296,7 +722,7 @@ class SceneGalleryLinker:
                 gallery_copy = gallery.copy()
                 gallery_copy["match_score"] = match_score
                 matches.append(gallery_copy)
-            else:
+            elif self._debug_enabled:
                 self.logger.debug(
                     f"Gallery '{gallery_title}' (ID {gallery['id']}) "
                     f"did not meet threshold ({match_score:.2f} <= {threshold:.2f})"
@@ -307,6 +733,356 @@ class SceneGalleryLinker:
         matches.sort(key=lambda x: x["match_score"], reverse=True)
         return matches[:3]  # Return top 3 matches
 
+    # Candidate-prefilter tuning: at most this many scenes per gallery get
+    # full weighted scoring, and trigram Jaccard below the floor is rejected.
+    CANDIDATE_LIMIT = 50
+    TRIGRAM_MIN_JACCARD = 0.1
+
+    # On-disk cache for the preprocessed scene index.
+    INDEX_CACHE_PATH = Path("~/.cache/gallery_linker/scene_index.pkl").expanduser()
+
+    def _index_cache_key(self) -> Optional[str]:
+        """Cheap library fingerprint: scene count plus the newest updated_at."""
+        query = """
+        query SceneIndexKey {
+            findScenes(filter: {per_page: 1, sort: "updated_at", direction: DESC}) {
+                count
+                scenes {
+                    updated_at
+                }
+            }
+        }
+        """
+        try:
+            result = self.stash.call_GQL(query)
+            data = result.get("data", result) if result else {}
+            found = data.get("findScenes", {})
+            scenes = found.get("scenes", [])
+            newest = scenes[0].get("updated_at", "") if scenes else ""
+            return f"{found.get('count', 0)}:{newest}"
+        except Exception as e:
+            self.logger.debug(f"Could not fingerprint scene library: {str(e)}")
+            return None
+
+    def get_scene_index(self, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Return the preprocessed scene index, reusing the on-disk cache when fresh.
+
+        The index (including the fetched scenes) is pickled alongside a
+        library fingerprint; while the fingerprint matches, repeated plugin
+        invocations skip both the scene fetch and all index preprocessing.
+
+        Args:
+            use_cache: Set False to force a rebuild
+
+        Returns:
+            Index dictionary from _build_scene_index
+        """
+        key = self._index_cache_key() if use_cache else None
+
+        if key is not None:
+            try:
+                with self.INDEX_CACHE_PATH.open("rb") as fh:
+                    cached_key, index = pickle.load(fh)
+                if cached_key == key:
+                    self.logger.debug(f"Using cached scene index ({key})")
+                    return index  # type: ignore[no-any-return]
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.debug(f"Ignoring unreadable scene index cache: {str(e)}")
+
+        index = self._build_scene_index(self._get_scenes_to_process())
+
+        if key is not None:
+            try:
+                self.INDEX_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                with self.INDEX_CACHE_PATH.open("wb") as fh:
+                    pickle.dump((key, index), fh, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                self.logger.debug(f"Could not write scene index cache: {str(e)}")
+
+        return index
+
+    @staticmethod
+    def similarity(a: str, b: str, score_cutoff: float = 0.0) -> float:
+        """Calculate normalized similarity between two pre-normalized strings, memoized across calls."""
+        return scoring.cached_similarity(a, b, score_cutoff=score_cutoff)
+
+    def _build_scene_index(self, scenes: List[Dict]) -> Dict[str, Any]:
+        """
+        Precompute per-scene match features and a trigram inverted index.
+
+        Built once per batch so gallery matching only touches cheap
+        precomputed data: normalized titles, lowercased file basenames, date
+        ordinals, performer-id sets, and a character-trigram posting list used
+        to prefilter candidates before any edit-distance work.
+
+        Args:
+            scenes: Scene dictionaries from the Stash API
+
+        Returns:
+            Index dictionary consumed by find_matching_scenes
+        """
+        norm_titles = []
+        basenames = []
+        date_ords = []
+        perf_sets = []
+        trigram_sizes = []
+        trigram_postings: Dict[str, List[int]] = {}
+        perf_postings: Dict[str, List[int]] = {}
+
+        for idx, scene in enumerate(scenes):
+            title = scoring.normalize_title(scene.get("title", ""))
+            norm_titles.append(title)
+            basenames.append(
+                [os.path.basename(f.get("path", "")).lower() for f in scene.get("files", []) if f.get("path")]
+            )
+            date_ords.append(_entity_date_ordinal(scene))
+            perf_ids = frozenset(str(p["id"]) for p in scene.get("performers", []))
+            perf_sets.append(perf_ids)
+            for pid in perf_ids:
+                perf_postings.setdefault(pid, []).append(idx)
+
+            trigrams = {title[i : i + 3] for i in range(len(title) - 2)}
+            trigram_sizes.append(len(trigrams))
+            for trigram in trigrams:
+                trigram_postings.setdefault(trigram, []).append(idx)
+
+        # SoA date-ordinal array: the per-gallery date window check becomes
+        # one vectorized comparison instead of a Python loop over dicts.
+        date_ord_arr = scoring.np.asarray(date_ords, dtype=scoring.np.int64) if scoring.HAS_NUMPY else None
+
+        return {
+            "scenes": scenes,
+            "norm_titles": norm_titles,
+            "basenames": basenames,
+            "date_ords": date_ords,
+            "date_ord_arr": date_ord_arr,
+            "perf_sets": perf_sets,
+            "trigram_sizes": trigram_sizes,
+            "trigram_postings": trigram_postings,
+            "perf_postings": perf_postings,
+        }
+
+    def _candidate_scenes(self, gallery_norm_title: str, scene_index: Dict[str, Any]) -> List[int]:
+        """Select candidate scene indices by trigram overlap with the gallery title."""
+        trigrams = {gallery_norm_title[i : i + 3] for i in range(len(gallery_norm_title) - 2)}
+        if not trigrams:
+            return list(range(len(scene_index["scenes"])))
+
+        postings = scene_index["trigram_postings"]
+        overlap_counts: Dict[int, int] = {}
+        for trigram in trigrams:
+            for idx in postings.get(trigram, ()):
+                overlap_counts[idx] = overlap_counts.get(idx, 0) + 1
+
+        sizes = scene_index["trigram_sizes"]
+        n_query = len(trigrams)
+        candidates = [
+            (count, idx)
+            for idx, count in overlap_counts.items()
+            if count / (n_query + sizes[idx] - count) >= self.TRIGRAM_MIN_JACCARD
+        ]
+        candidates.sort(reverse=True)
+        return [idx for _, idx in candidates[: self.CANDIDATE_LIMIT]]
+
+    def find_matching_scenes(
+        self,
+        gallery: Dict,
+        scene_index: Dict[str, Any],
+        minimum_score: float = 0.3,
+        tolerance: int = 7,
+        top_k: int = 10,
+        config: ScoringConfig = DEFAULT_SCORING_CONFIG,
+    ) -> List[MatchResult]:
+        """
+        Find scenes matching a gallery using the precomputed scene index.
+
+        A cheap trigram-overlap prefilter reduces the full scene list to at
+        most CANDIDATE_LIMIT candidates; only those get the full weighted
+        scoring (title, date, filename, performer overlap).
+
+        Args:
+            gallery: Gallery dictionary from the Stash API
+            scene_index: Index from _build_scene_index
+            minimum_score: Matches scoring below this are dropped
+            tolerance: Date tolerance in days
+            top_k: Maximum number of matches to return
+            config: Scoring weights and thresholds
+
+        Returns:
+            MatchResult list sorted by score (highest first)
+        """
+        gallery_path = self._get_gallery_path(gallery)
+        gallery_norm_title = self._gallery_norm_title(gallery)
+        gallery_basename = os.path.basename(gallery_path).lower() if gallery_path else ""
+        gallery_ord = _entity_date_ordinal(gallery)
+        gallery_perf_ids = frozenset(str(p["id"]) for p in gallery.get("performers", []))
+
+        # With no title, date, filename or performers, every scorer returns
+        # zero — skip candidate generation and scoring entirely.
+        if not gallery_norm_title and not gallery_basename and gallery_ord < 0 and not gallery_perf_ids:
+            if self._debug_enabled:
+                self.logger.debug(f"Gallery {gallery.get('id', 'unknown')} has no matchable signal, skipping")
+            return []
+
+        scenes = scene_index["scenes"]
+        norm_titles = scene_index["norm_titles"]
+        basenames = scene_index["basenames"]
+        date_ords = scene_index["date_ords"]
+        perf_sets = scene_index["perf_sets"]
+
+        candidate_idx = self._candidate_scenes(gallery_norm_title, scene_index)
+        if gallery_ord >= 0:
+            # Scenes inside the date window are candidates regardless of title
+            # overlap; with numpy this is a single vectorized mask.
+            date_ord_arr = scene_index["date_ord_arr"]
+            if date_ord_arr is not None:
+                mask = (date_ord_arr >= 0) & (scoring.np.abs(date_ord_arr - gallery_ord) <= tolerance)
+                in_window = set(scoring.np.nonzero(mask)[0].tolist())
+            else:
+                in_window = {
+                    i for i, ordinal in enumerate(date_ords) if 0 <= ordinal and abs(ordinal - gallery_ord) <= tolerance
+                }
+            in_window.difference_update(candidate_idx)
+            if in_window:
+                candidate_idx = list(candidate_idx) + sorted(in_window)
+        if gallery_perf_ids:
+            # Scenes sharing a performer are candidates even when their titles
+            # share no trigrams; the posting lists make this a set union
+            # instead of a scan over every scene's performer set.
+            perf_postings = scene_index["perf_postings"]
+            shared: set = set()
+            for pid in gallery_perf_ids:
+                shared.update(perf_postings.get(pid, ()))
+            shared.difference_update(candidate_idx)
+            if shared:
+                candidate_idx = list(candidate_idx) + sorted(shared)
+
+        # Snapshot config fields and method lookups into locals: the loop body
+        # then runs on LOAD_FAST instead of repeated attribute dereferences.
+        title_weight = config.title_similarity_weight
+        date_weight = config.date_match_weight
+        filename_weight = config.filename_similarity_weight
+        performer_weight = config.performer_overlap_weight
+        score_title = self._score_title_similarity
+        score_date = self._score_date_match
+        score_filename = self._score_filename_similarity
+        score_performers = self._score_performer_overlap
+
+        # With rapidfuzz, all candidate title similarities come from one
+        # batched cdist call (C loop, GIL released) instead of one Python
+        # dispatch per candidate.
+        batched_title_sims = None
+        if scoring.HAS_RAPIDFUZZ and gallery_norm_title and len(candidate_idx) > 8:
+            batched_title_sims = scoring.similarity_matrix(
+                [gallery_norm_title],
+                [norm_titles[idx] for idx in candidate_idx],
+                score_cutoff=config.title_similarity_threshold,
+            )[0]
+
+        # Bounded min-heap of (score, -order, scene idx, reasons): candidates
+        # that cannot beat the current k-th best are dropped in O(1) and never
+        # become MatchResult objects; only the k winners get materialized.
+        # Best score still attainable after each scoring step; once the
+        # running total plus the remainder cannot reach minimum_score the
+        # candidate is dropped without computing the remaining components.
+        # Filename similarity is the most expensive scorer, so it runs last.
+        rem_after_title = date_weight + performer_weight + filename_weight
+        rem_after_date = performer_weight + filename_weight
+        rem_after_performers = filename_weight
+
+        heap: List[Tuple[float, int, int, tuple]] = []
+        order = 0
+        for pos, idx in enumerate(candidate_idx):
+            reasons = []
+
+            if batched_title_sims is not None:
+                title_score = batched_title_sims[pos]
+            else:
+                title_score = score_title(gallery_norm_title, norm_titles[idx], config)
+            if title_score > 0:
+                reasons.append(f"title similarity {title_score:.2f}")
+            score = title_weight * title_score
+            if score + rem_after_title < minimum_score:
+                continue
+
+            date_score = score_date(gallery_ord, date_ords[idx], tolerance)
+            if date_score > 0:
+                reasons.append(f"date within {tolerance} days")
+            score += date_weight * date_score
+            if score + rem_after_date < minimum_score:
+                continue
+
+            performer_score = score_performers(gallery_perf_ids, perf_sets[idx])
+            if performer_score > 0:
+                reasons.append(f"performer overlap {performer_score:.2f}")
+            score += performer_weight * performer_score
+            if score + rem_after_performers < minimum_score:
+                continue
+
+            filename_score = score_filename(gallery_basename, basenames[idx], config)
+            if filename_score > 0:
+                reasons.append(f"filename similarity {filename_score:.2f}")
+            score += filename_weight * filename_score
+
+            if score >= minimum_score:
+                entry = (min(score, 1.0), -order, idx, tuple(reasons))
+                order += 1
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        return [
+            MatchResult.unchecked(scenes[idx], score, reasons) for score, _, idx, reasons in sorted(heap, reverse=True)
+        ]
+
+    def _score_title_similarity(self, gallery_norm_title: str, scene_norm_title: str, config: ScoringConfig) -> float:
+        """Score title similarity, zero below the configured threshold."""
+        if not gallery_norm_title or not scene_norm_title:
+            return 0.0
+        return self.similarity(gallery_norm_title, scene_norm_title, score_cutoff=config.title_similarity_threshold)
+
+    def _score_date_match(self, gallery_ord: int, scene_ord: int, tolerance: int) -> float:
+        """Score date proximity as a linear falloff within the tolerance window."""
+        if gallery_ord < 0 or scene_ord < 0 or tolerance <= 0:
+            return 0.0
+        diff = abs(gallery_ord - scene_ord)
+        if diff > tolerance:
+            return 0.0
+        return 1.0 - diff / tolerance
+
+    def _score_filename_similarity(
+        self, gallery_basename: str, scene_basenames: List[str], config: ScoringConfig
+    ) -> float:
+        """Score the best similarity between the gallery file and any scene file."""
+        if not gallery_basename or not scene_basenames:
+            return 0.0
+        cutoff = config.filename_similarity_threshold
+        # Token-set scoring is order-insensitive, which suits filenames where
+        # the same words show up rearranged or with extra qualifiers.
+        return max(
+            scoring.token_set_similarity(gallery_basename, name, score_cutoff=cutoff) for name in scene_basenames
+        )
+
+    def _score_performer_overlap(self, gallery_perf_ids: frozenset, scene_perf_ids: frozenset) -> float:
+        """Score performer overlap as Jaccard similarity of the id sets."""
+        if not gallery_perf_ids or not scene_perf_ids:
+            return 0.0
+        # Single-performer entries are the common case; a membership test
+        # avoids allocating an intersection set per pair.
+        if len(gallery_perf_ids) == 1:
+            overlap = 1 if next(iter(gallery_perf_ids)) in scene_perf_ids else 0
+        elif len(scene_perf_ids) == 1:
+            overlap = 1 if next(iter(scene_perf_ids)) in gallery_perf_ids else 0
+        else:
+            overlap = len(gallery_perf_ids & scene_perf_ids)
+        if not overlap:
+            return 0.0
+        return overlap / (len(gallery_perf_ids) + len(scene_perf_ids) - overlap)
+
     def _get_scene_path(self, scene: Dict) -> str:
         """Extract the file path from a scene object."""
         files = scene.get("files", [])
@@ -367,22 +1143,15 @@ class SceneGalleryLinker:
 
         return 0.0
 
-    def _calculate_name_similarity_score(self, scene_title: str, gallery_title: str) -> float:
-        """Calculate similarity between scene and gallery titles."""
-        if not scene_title or not gallery_title:
-            return 0.0
-
-        # Simple similarity based on common words
-        scene_words = set(scene_title.lower().split())
-        gallery_words = set(gallery_title.lower().split())
-
-        if not scene_words or not gallery_words:
-            return 0.0
-
-        intersection = scene_words.intersection(gallery_words)
-        union = scene_words.union(gallery_words)
-
-        return len(intersection) / len(union) if union else 0.0
+    def _gallery_norm_title(self, gallery: Dict) -> str:
+        """Get the normalized title of a gallery, computed once and cached."""
+        key = (gallery["id"], gallery.get("updated_at"))
+        norm_title = self._norm_title_cache.get(key)
+        if norm_title is None:
+            title = gallery.get("title", "") or self._extract_gallery_title_from_path(self._get_gallery_path(gallery))
+            norm_title = scoring.normalize_title(title)
+            self._norm_title_cache[key] = norm_title
+        return norm_title
 
     def _extract_gallery_title_from_path(self, gallery_path: str) -> str:
         """
@@ -0,0 +1,175 @@
+"""String-similarity scoring helpers for the GalleryLinker plugin.
+
+Uses rapidfuzz's C-accelerated normalized Indel distance when available and
+falls back to the stdlib difflib implementation otherwise, so the plugin keeps
+working in environments where the optional dependency is missing.
+"""
+
+import re
+import threading
+import unicodedata
+from typing import List, Sequence
+
+try:
+    from rapidfuzz import fuzz as _rf_fuzz
+    from rapidfuzz import process as _rf_process
+    from rapidfuzz.distance import Indel as _Indel
+
+    HAS_RAPIDFUZZ = True
+except ImportError:
+    from difflib import SequenceMatcher as _SequenceMatcher
+
+    HAS_RAPIDFUZZ = False
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    np = None  # type: ignore[assignment]
+    HAS_NUMPY = False
+
+
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def normalize_title(text: str) -> str:
+    """
+    Normalize a title for similarity comparison.
+
+    Applies unicode NFKD normalization, casefolding and whitespace collapsing.
+    Callers should compute this once per entity and reuse the result rather
+    than re-normalizing inside matching loops.
+
+    Args:
+        text: Raw title string
+
+    Returns:
+        Normalized title string
+    """
+    if not text:
+        return ""
+    return _NON_WORD_RE.sub(" ", unicodedata.normalize("NFKD", text).casefold()).strip()
+
+
+def string_similarity(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """
+    Calculate normalized similarity between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+        score_cutoff: Scores below this value are reported as 0.0. When
+            rapidfuzz is installed this lets the C implementation abandon
+            comparisons early via length bounds.
+
+    Returns:
+        Similarity score between 0.0 and 1.0
+    """
+    if not a or not b:
+        return 0.0
+
+    if score_cutoff > 0.0:
+        # Indel distance is at least ||a|-|b||, so the similarity is at most
+        # 1 - ||a|-|b||/(|a|+|b|); reject on lengths alone when that bound
+        # cannot reach the cutoff.
+        la, lb = len(a), len(b)
+        if (la + lb) * (1.0 - score_cutoff) < abs(la - lb):
+            return 0.0
+
+    if HAS_RAPIDFUZZ:
+        return float(_Indel.normalized_similarity(a, b, score_cutoff=score_cutoff))
+
+    score = _SequenceMatcher(None, a, b).ratio()
+    return score if score >= score_cutoff else 0.0
+
+
+# Plain-dict similarity cache. A deliberate non-use of functools.lru_cache:
+# its wrapper overhead (tuple packing, linked-list maintenance under a lock)
+# dominates a cache hit for a function this small. Keys are symmetric ordered
+# pairs so (a, b) and (b, a) share an entry; eviction drops an arbitrary entry
+# once the cap is reached, which is cheap and good enough for this workload.
+# Lookups stay lock-free (a racy miss just recomputes); mutations go through
+# _SIM_CACHE_LOCK because the matcher's thread pool calls this concurrently.
+_SIM_CACHE: dict = {}
+_SIM_CACHE_MAX = 4096
+_SIM_CACHE_LOCK = threading.Lock()
+
+
+def cached_similarity(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """
+    Memoized string_similarity for pairs that recur across matching loops.
+
+    The cache stores the uncut score, so one entry serves every cutoff; the
+    caller's score_cutoff is applied to the cached value on the way out.
+
+    Args:
+        a: First string
+        b: Second string
+        score_cutoff: Scores below this value are reported as 0.0
+
+    Returns:
+        Similarity score between 0.0 and 1.0
+    """
+    key = (a, b) if a <= b else (b, a)
+    score = _SIM_CACHE.get(key)
+    if score is None:
+        score = string_similarity(a, b)
+        with _SIM_CACHE_LOCK:
+            if len(_SIM_CACHE) >= _SIM_CACHE_MAX:
+                _SIM_CACHE.pop(next(iter(_SIM_CACHE)), None)
+            _SIM_CACHE[key] = score
+    return score if score >= score_cutoff else 0.0
+
+
+def token_set_similarity(a: str, b: str, score_cutoff: float = 0.0) -> float:
+    """
+    Calculate word-order-insensitive similarity between two strings.
+
+    Suited to filenames, where the same tokens often appear in a different
+    order or with extra qualifiers ("2024 beach trip" vs "beach trip 2024
+    1080p"). Uses rapidfuzz's token_set_ratio when available; the fallback
+    compares sorted token sets with the plain similarity scorer.
+
+    Args:
+        a: First string
+        b: Second string
+        score_cutoff: Scores below this value are reported as 0.0
+
+    Returns:
+        Similarity score between 0.0 and 1.0
+    """
+    if not a or not b:
+        return 0.0
+
+    if HAS_RAPIDFUZZ:
+        return _rf_fuzz.token_set_ratio(a, b, score_cutoff=score_cutoff * 100.0) / 100.0
+
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    if tokens_a <= tokens_b or tokens_b <= tokens_a:
+        return 1.0
+    return string_similarity(" ".join(sorted(tokens_a)), " ".join(sorted(tokens_b)), score_cutoff=score_cutoff)
+
+
+def similarity_matrix(queries: Sequence[str], choices: Sequence[str], score_cutoff: float = 0.0) -> List[List[float]]:
+    """
+    Compute the full queries x choices similarity matrix.
+
+    With rapidfuzz installed this is a single C call (`process.cdist`) instead
+    of a Python double loop.
+
+    Args:
+        queries: Row strings (e.g. scene titles)
+        choices: Column strings (e.g. gallery titles)
+        score_cutoff: Scores below this value are reported as 0.0
+
+    Returns:
+        Matrix of similarity scores, one row per query
+    """
+    if HAS_RAPIDFUZZ:
+        matrix = _rf_process.cdist(queries, choices, scorer=_Indel.normalized_similarity, score_cutoff=score_cutoff)
+        return [list(row) for row in matrix]
+
+    return [[string_similarity(q, c, score_cutoff) for c in choices] for q in queries]
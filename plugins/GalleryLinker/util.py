@@ -3,11 +3,57 @@
 import json
 import re
 from dataclasses import asdict
+from datetime import date
 from pathlib import Path
 from typing import Optional
 
 from datatypes import SettingsSchema
 
+# Default settings computed (and validated) once at import; callers get a
+# shallow copy instead of re-running SettingsSchema construction per call.
+_DEFAULT_SETTINGS = asdict(SettingsSchema())
+
+# Single fused alternation compiled at import, so one pass over the filename
+# classifies the date format (YYYY-MM-DD, DD-MM-YYYY or compact YYYYMMDD)
+# instead of running one search per pattern.
+_DATE_RE = re.compile(
+    r"(?P<y1>\d{4})[._-](?P<m1>\d{2})[._-](?P<d1>\d{2})"
+    r"|(?P<d2>\d{2})[._-](?P<m2>\d{2})[._-](?P<y2>\d{4})"
+    r"|(?P<y3>\d{4})(?P<m3>\d{2})(?P<d3>\d{2})"
+)
+
+
+def extract_date_from_filename(filename: str) -> Optional[str]:
+    """
+    Extract a release date embedded in a filename.
+
+    Args:
+        filename: File name (or path component) to scan
+
+    Returns:
+        ISO formatted date string, or None if no valid date is found
+    """
+    if not filename:
+        return None
+
+    # Later matches are still tried when an earlier one fails validation
+    # (e.g. an id prefix like IMG_123456789 matching the compact branch),
+    # so a bogus digit run cannot shadow a real date further along.
+    for match in _DATE_RE.finditer(filename):
+        if match.group("y1"):
+            year, month, day = match.group("y1", "m1", "d1")
+        elif match.group("y2"):
+            day, month, year = match.group("d2", "m2", "y2")
+        else:
+            year, month, day = match.group("y3", "m3", "d3")
+
+        try:
+            return date(int(year), int(month), int(day)).isoformat()
+        except ValueError:
+            continue
+
+    return None
+
 
 def extract_gallery_title(gallery_path: Optional[str]) -> str:
     """
@@ -41,7 +87,7 @@ def extract_gallery_title(gallery_path: Optional[str]) -> str:
 def parse_settings_argument(settings_json: str) -> dict:
     """Parse settings JSON string into object using schema from gallery_linker.yml."""
     if not settings_json:
-        return asdict(SettingsSchema())
+        return dict(_DEFAULT_SETTINGS)
 
     try:
         settings = json.loads(settings_json)